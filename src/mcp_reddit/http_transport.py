@@ -0,0 +1,28 @@
+"""redditwarp transport adapter backed by a tuned httpx connection pool.
+
+redditwarp builds its connectors through a pluggable transport adapter module
+(see `redditwarp.http.transport.reg_ASYNC`). This module implements that
+interface on top of redditwarp's own httpx connector, but configures the pool
+so that connections and TLS sessions to Reddit are kept alive and reused
+across tool invocations.
+
+The client is built without a custom transport, so httpx still honors the
+HTTP(S)_PROXY / ALL_PROXY / NO_PROXY environment variables.
+"""
+import httpx
+# `Connector`, `name` and `version` are part of the adapter interface.
+from redditwarp.http.transport.impls.httpx_ASYNC import HttpxConnector as Connector, name, version
+
+# Nearly all traffic goes to oauth.reddit.com, so these limits effectively
+# apply per host. Every connection may stay idle in the pool, so bursts of
+# concurrent tool calls don't pay for a fresh TCP/TLS handshake afterwards.
+HTTP_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=100,
+    keepalive_expiry=60,
+)
+# Rate limiting (429s) is handled by redditwarp's RateLimited handler, which
+# paces requests using Reddit's X-Ratelimit headers.
+
+def new_connector() -> Connector:
+    return Connector(httpx.AsyncClient(limits=HTTP_LIMITS))
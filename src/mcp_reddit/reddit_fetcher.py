@@ -1,82 +1,275 @@
+import anyio
+import asyncio
+import contextlib
+import functools
+import inspect
+import io
+import itertools
+import json
 import os
+import time
+from collections import OrderedDict
 from typing import Optional
 from redditwarp.ASYNC import Client
+from redditwarp.http.transport.reg_ASYNC import set_transport_adapter_module
 from redditwarp.models.submission_ASYNC import LinkPost, TextPost, GalleryPost
 from fastmcp import FastMCP
 import logging
 
-mcp = FastMCP("Reddit MCP")
+from mcp_reddit import http_transport
 
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# The lifespan is entered once per client session (e.g. per SSE connection),
+# but the Reddit client is shared by all of them
+_active_sessions = 0
+
+@contextlib.asynccontextmanager
+async def _lifespan(server):
+    """Close the shared Reddit client, if one was created, when the last session ends"""
+    global _active_sessions
+    _active_sessions += 1
+    try:
+        yield
+    finally:
+        _active_sessions -= 1
+        if not _active_sessions and _client.cache_info().currsize:
+            client = _client()
+            # Forget it before closing, so a session starting meanwhile gets a new one
+            _client.cache_clear()
+            await client.close()
+            logger.info("Reddit client closed")
+
+mcp = FastMCP("Reddit MCP", lifespan=_lifespan)
+
+# Handlers are left to the host process, or attached by main() when running
+# as the server; set MCP_REDDIT_LOG_LEVEL=DEBUG for verbose output from this
+# module. Unknown levels fall back to INFO.
+LOG_LEVEL = os.getenv("MCP_REDDIT_LOG_LEVEL", "INFO").upper()
 logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+logger.setLevel(logging.getLevelNamesMapping().get(LOG_LEVEL, logging.INFO))
 
 REDDIT_CLIENT_ID=os.getenv("REDDIT_CLIENT_ID")
 REDDIT_CLIENT_SECRET=os.getenv("REDDIT_CLIENT_SECRET")
 REDDIT_REFRESH_TOKEN=os.getenv("REDDIT_REFRESH_TOKEN")
 
-logger.debug(f"Reddit credentials found: CLIENT_ID={'***' if REDDIT_CLIENT_ID else None}, CLIENT_SECRET={'***' if REDDIT_CLIENT_SECRET else None}, REFRESH_TOKEN={'***' if REDDIT_REFRESH_TOKEN else None}")
+logger.debug("Reddit credentials found: CLIENT_ID=%s, CLIENT_SECRET=%s, REFRESH_TOKEN=%s", '***' if REDDIT_CLIENT_ID else None, '***' if REDDIT_CLIENT_SECRET else None, '***' if REDDIT_REFRESH_TOKEN else None)
 
-CREDS = [x for x in [REDDIT_CLIENT_ID, REDDIT_CLIENT_SECRET, REDDIT_REFRESH_TOKEN] if x]
-logger.debug(f"Using {len(CREDS)} credentials for Reddit client")
+CREDS = (REDDIT_CLIENT_ID, REDDIT_CLIENT_SECRET, REDDIT_REFRESH_TOKEN)
+logger.debug("Using %s credentials for Reddit client", sum(1 for cred in CREDS if cred))
 
-client = Client(*CREDS)
-logger.info("Reddit client initialized successfully")
+def _client_credentials() -> tuple[str, ...]:
+    """Return the credentials to build the client with, rejecting incomplete sets.
+
+    redditwarp picks its auth flow from the number of positional credentials,
+    so a partial set (e.g. a client ID without its secret) would otherwise be
+    misread and only fail once the first request is authorized.
+    """
+    client_id, client_secret, refresh_token = CREDS
+    if not any(CREDS):
+        return ()
+    if not (client_id and client_secret):
+        raise RuntimeError(
+            "Missing Reddit credentials: REDDIT_CLIENT_ID and REDDIT_CLIENT_SECRET must both be set"
+        )
+    if refresh_token:
+        return client_id, client_secret, refresh_token
+    return client_id, client_secret
+
+@functools.lru_cache(maxsize=1)
+def _client() -> Client:
+    """Create the shared Reddit client on first use"""
+    creds = _client_credentials()
+    # Route the client through a shared, keepalive-tuned httpx connection pool
+    set_transport_adapter_module(http_transport)
+    client = Client(*creds)
+    logger.info("Reddit client initialized successfully")
+    return client
+
+# Seconds that formatted listing results and fetched posts stay cached.
+# Trending subreddits change roughly hourly, so they can be kept longer.
+LISTING_CACHE_TTL = 60
+TRENDING_CACHE_TTL = 300
+POST_CACHE_TTL = 120
+
+class _TTLCache:
+    """Small LRU cache whose entries expire `ttl` seconds after being set.
+
+    Expired entries are dropped when read, and swept out on writes at most
+    once per `ttl`, so stale values don't linger until the LRU overflows.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._next_purge = time.monotonic() + ttl
+
+    def get(self, key):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key, value) -> None:
+        now = time.monotonic()
+        if now >= self._next_purge:
+            self._purge(now)
+        self._data[key] = (now + self.ttl, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def _purge(self, now: float) -> None:
+        expired = [key for key, (expires_at, _) in self._data.items() if expires_at < now]
+        for key in expired:
+            del self._data[key]
+        self._next_purge = now + self.ttl
+
+ERROR_PREFIX = "An error occurred: "
+
+def _error_response(e: BaseException, context: str, *args) -> str:
+    """Helper method to log a failed tool call and build its error response.
+
+    `context` and `args` describe the call in the lazy %-style of the logger.
+    """
+    logger.error("Error in " + context + ": %s", *args, e, exc_info=e)
+    return ERROR_PREFIX + str(e)
+
+def _cached_tool(ttl: float, maxsize: int = 1024):
+    """Cache the string returned by an async tool, keyed by its arguments.
+
+    Error responses are never cached.
+    """
+    def decorator(fn):
+        cache = _TTLCache(maxsize, ttl)
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = tuple(
+                tuple(value) if isinstance(value, list) else value
+                for value in bound.arguments.values()
+            )
+            result = cache.get(key)
+            if result is not None:
+                logger.debug("Cache hit for %s%s", fn.__name__, key)
+                return result
+            result = await fn(*args, **kwargs)
+            if not result.startswith(ERROR_PREFIX):
+                cache.set(key, result)
+            return result
+
+        return wrapper
+    return decorator
 
 @mcp.tool()
-async def fetch_reddit_hot_threads(subreddit: str, limit: int = 10) -> str:
+@_cached_tool(LISTING_CACHE_TTL)
+async def fetch_reddit_hot_threads(subreddit: str, limit: int = 10, as_json: bool = False) -> str:
     """
     Fetch hot threads from a subreddit
 
     Args:
         subreddit: Name of the subreddit
         limit: Number of posts to fetch (default: 10)
+        as_json: Return the posts as a JSON array instead (default: False)
 
     Returns:
         Human readable string containing list of post information
     """
-    logger.info(f"fetch_reddit_hot_threads called with subreddit='{subreddit}', limit={limit}")
+    logger.info("fetch_reddit_hot_threads called with subreddit='%s', limit=%s", subreddit, limit)
     try:
-        posts = []
-        logger.debug(f"Starting to fetch hot posts from r/{subreddit}")
-        async for submission in client.p.subreddit.pull.hot(subreddit, limit):
-            logger.debug(f"Processing submission: {submission.id} - {submission.title[:50]}")
-            post_info = (
-                f"Title: {submission.title}\n"
-                f"Score: {submission.score}\n"
-                f"Comments: {submission.comment_count}\n"
-                f"Author: {submission.author_display_name or '[deleted]'}\n"
-                f"Type: {_get_post_type(submission)}\n"
-                f"Content: {_get_content(submission)}\n"
-                f"Link: https://reddit.com{submission.permalink}\n"
-                f"---"
-            )
-            posts.append(post_info)
-
-        logger.info(f"Successfully fetched {len(posts)} hot posts from r/{subreddit}")
-        return "\n\n".join(posts)
+        logger.debug("Starting to fetch hot posts from r/%s", subreddit)
+        content, count = await _collect_listing(_client().p.subreddit.pull.hot(subreddit, limit), as_json=as_json)
+        logger.info("Successfully fetched %s hot posts from r/%s", count, subreddit)
+        return content
 
     except Exception as e:
-        logger.error(f"Error in fetch_reddit_hot_threads: {str(e)}", exc_info=True)
-        return f"An error occurred: {str(e)}"
-
-def _format_comment_tree(comment_node, depth: int = 0) -> str:
-    """Helper method to recursively format comment tree with proper indentation"""
-    comment = comment_node.value
-    indent = "-- " * depth
-    content = (
-        f"{indent}* Author: {comment.author_display_name or '[deleted]'}\n"
-        f"{indent}  Score: {comment.score}\n"
-        f"{indent}  {comment.body}\n"
-    )
+        return _error_response(e, "fetch_reddit_hot_threads")
+
+# (bullet line prefix, continuation line prefix) for each comment depth
+_INDENTS = [("-- " * depth, "-- " * depth + "  ") for depth in range(64)]
+
+_COMMENT_TEMPLATE = "%s* Author: %s\n%sScore: %d\n%s%s\n"
 
-    for child in comment_node.children:
-        content += "\n" + _format_comment_tree(child, depth + 1)
+# Bodies Reddit leaves behind for deleted and removed comments; these are
+# shown as a one-line marker, though their replies are still formatted
+_DELETED_BODIES = frozenset(("[deleted]", "[removed]"))
+_DELETED_COMMENT_TEMPLATE = "%s* %s\n"
 
-    return content
+# Rough cap on the characters of formatted comments in one post's output
+COMMENT_TREE_CHAR_BUDGET = 50_000
+
+def _format_comment_tree(comment_nodes, budget: int = COMMENT_TREE_CHAR_BUDGET) -> str:
+    """Helper method to format comment trees with proper indentation.
+
+    Walks the trees depth-first with an explicit stack and joins the
+    formatted comments once at the end. Once `budget` characters have been
+    formatted, the remaining comments are summarized in a single marker.
+    """
+    parts = []
+    indents = _INDENTS
+    max_cached_depth = len(indents)
+    stack = [(node, 0) for node in reversed(comment_nodes)]
+    while stack:
+        if budget <= 0:
+            skipped = 0
+            while stack:
+                node, _ = stack.pop()
+                skipped += 1
+                stack.extend((child, 0) for child in node.children)
+            logger.debug("Comment budget exhausted, skipping %s comments", skipped)
+            parts.append("... (%d more comments)" % skipped)
+            break
+        node, depth = stack.pop()
+        if depth < max_cached_depth:
+            bullet, sub = indents[depth]
+        else:
+            bullet = "-- " * depth
+            sub = bullet + "  "
+        comment = node.value
+        body = comment.body
+        if not body or body in _DELETED_BODIES:
+            part = _DELETED_COMMENT_TEMPLATE % (bullet, body or '[deleted]')
+        else:
+            part = _COMMENT_TEMPLATE % (
+                bullet, comment.author_display_name or '[deleted]',
+                sub, comment.score,
+                sub, body,
+            )
+        parts.append(part)
+        budget -= len(part)
+        for child in reversed(node.children):
+            stack.append((child, depth + 1))
+
+    return "\n".join(parts)
+
+_POST_DETAILS_TEMPLATE = (
+    "Title: %s\n"
+    "Score: %d\n"
+    "Author: %s\n"
+    "Type: %s\n"
+    "Content: %s\n"
+    "Link: %s\n"
+)
+
+# Comment trees are full object graphs, so keep far fewer of them than strings
+_COMMENT_TREE_CACHE = _TTLCache(maxsize=64, ttl=POST_CACHE_TTL)
+
+async def _fetch_comment_tree(post_id: str, comment_sort: str, comment_limit: int):
+    """Helper method to fetch a comment tree, reusing a recently fetched one"""
+    key = (post_id, comment_sort, comment_limit)
+    comments = _COMMENT_TREE_CACHE.get(key)
+    if comments is None:
+        comments = await _client().p.comment_tree.fetch(post_id, sort=comment_sort, limit=comment_limit)
+        _COMMENT_TREE_CACHE.set(key, comments)
+    return comments
 
 @mcp.tool()
 async def get_post_details(post_id: str, comment_limit: int = 100, comment_sort: str = "best") -> str:
@@ -91,61 +284,235 @@ async def get_post_details(post_id: str, comment_limit: int = 100, comment_sort:
     Returns:
         Human readable string containing post content and comments tree.
     """
-    logger.info(f"get_post_details called with post_id='{post_id}', comment_limit={comment_limit}, comment_sort='{comment_sort}'")
+    logger.info("get_post_details called with post_id='%s', comment_limit=%s, comment_sort='%s'", post_id, comment_limit, comment_sort)
     try:
-        logger.debug(f"Fetching submission details for post_id: {post_id}")
-        submission = await client.p.submission.fetch(post_id)
-        logger.debug(f"Retrieved submission: {submission.title[:50]}")
-
-        content = (
-            f"Title: {submission.title}\n"
-            f"Score: {submission.score}\n"
-            f"Author: {submission.author_display_name or '[deleted]'}\n"
-            f"Type: {_get_post_type(submission)}\n"
-            f"Content: {_get_content(submission)}\n"
-            f"Link: https://reddit.com{submission.permalink}\n"
+        # The comment tree response carries the submission itself, so one
+        # request covers both the post and its comments.
+        logger.debug("Fetching comment tree for post_id: %s with sort=%s, limit=%s", post_id, comment_sort, comment_limit)
+        comments = await _fetch_comment_tree(post_id, comment_sort, comment_limit)
+        submission = comments.value
+        logger.debug("Retrieved submission: %.50s", submission.title)
+
+        post_type, post_content = _type_and_content(submission)
+        content = _POST_DETAILS_TEMPLATE % (
+            submission.title, submission.score,
+            submission.author_display_name or '[deleted]',
+            post_type, post_content, submission.permalink,
         )
 
-        logger.debug(f"Fetching comment tree for post_id: {post_id} with sort={comment_sort}, limit={comment_limit}")
-        comments = await client.p.comment_tree.fetch(post_id, sort=comment_sort, limit=comment_limit)
         if comments.children:
-            logger.debug(f"Found {len(comments.children)} top-level comments")
-            content += "\nComments:\n"
-            for comment in comments.children:
-                content += "\n" + _format_comment_tree(comment)
+            logger.debug("Found %s top-level comments", len(comments.children))
+            content += "\nComments:\n\n" + _format_comment_tree(comments.children)
         else:
             logger.debug("No comments found for this post")
             content += "\nNo comments found."
 
-        logger.info(f"Successfully retrieved post details for {post_id}")
+        logger.info("Successfully retrieved post details for %s", post_id)
         return content
 
     except Exception as e:
-        logger.error(f"Error in get_post_details for post_id '{post_id}': {str(e)}", exc_info=True)
-        return f"An error occurred: {str(e)}"
-
-def _get_post_type(submission) -> str:
-    """Helper method to determine post type"""
-    if isinstance(submission, LinkPost):
-        return 'link'
-    elif isinstance(submission, TextPost):
-        return 'text'
-    elif isinstance(submission, GalleryPost):
-        return 'gallery'
-    return 'unknown'
-
-def _get_content(submission) -> Optional[str]:
-    """Helper method to extract post content based on type"""
-    if isinstance(submission, LinkPost):
-        return submission.permalink
-    elif isinstance(submission, TextPost):
-        return submission.body
-    elif isinstance(submission, GalleryPost):
-        return str(submission.gallery_link)
-    return None
+        return _error_response(e, "get_post_details for post_id '%s'", post_id)
+
+# Dispatched on the submission's class, so subclasses of these post types
+# are handled too; singledispatch caches the lookup per concrete class
+@functools.singledispatch
+def _type_and_content(submission) -> tuple[str, str]:
+    """Helper method to determine post type and extract content based on type"""
+    return 'unknown', '<none>'
+
+@_type_and_content.register
+def _(submission: LinkPost) -> tuple[str, str]:
+    return 'link', submission.link
+
+@_type_and_content.register
+def _(submission: TextPost) -> tuple[str, str]:
+    return 'text', submission.body
+
+@_type_and_content.register
+def _(submission: GalleryPost) -> tuple[str, str]:
+    return 'gallery', str(submission.gallery_link)
+
+_POST_TEMPLATE = (
+    "Title: %s\n"
+    "Score: %d\n"
+    "Comments: %d\n"
+    "Author: %s\n"
+    "Type: %s\n"
+    "Content: %s\n"
+    "Link: %s\n"
+    "---"
+)
+
+_USER_POST_TEMPLATE = (
+    "Title: %s\n"
+    "Score: %d\n"
+    "Comments: %d\n"
+    "Type: %s\n"
+    "Content: %s\n"
+    "Link: %s\n"
+    "---"
+)
+
+_USER_COMMENT_TEMPLATE = (
+    "Post ID: %s\n"
+    "Score: %d\n"
+    "Content: %s\n"
+    "Link: %s\n"
+    "---"
+)
+
+def _format_submission(submission) -> str:
+    """Helper method to format a submission for post listings"""
+    type_str, content_str = _type_and_content(submission)
+    return _POST_TEMPLATE % (
+        submission.title,
+        submission.score,
+        submission.comment_count,
+        submission.author_display_name or '[deleted]',
+        type_str,
+        content_str,
+        submission.permalink,
+    )
+
+def _format_user_submission(submission) -> str:
+    """Helper method to format a submission for user post listings"""
+    type_str, content_str = _type_and_content(submission)
+    return _USER_POST_TEMPLATE % (
+        submission.title,
+        submission.score,
+        submission.comment_count,
+        type_str,
+        content_str,
+        submission.permalink,
+    )
+
+def _submission_record(submission) -> dict:
+    """Helper method to describe a submission for JSON post listings"""
+    type_str, content_str = _type_and_content(submission)
+    return {
+        "id": submission.id,
+        "title": submission.title,
+        "score": submission.score,
+        "comments": submission.comment_count,
+        "author": submission.author_display_name or None,
+        "type": type_str,
+        "content": content_str if type_str != 'unknown' else None,
+        "link": submission.permalink,
+    }
+
+# Reddit serves listings in pages of up to 100 items, so buffering that many
+# lets the next page be requested while the current one is being formatted
+PREFETCH_DEPTH = 100
+
+async def _prefetch(items, depth: int = PREFETCH_DEPTH):
+    """Helper method to pull from an async iterator ahead of its consumer.
+
+    A background task buffers up to `depth` items and re-raises any error
+    from the iterator once the items before it have been consumed.
+    """
+    queue = asyncio.Queue(maxsize=depth)
+    done = object()
+    error = None
+
+    async def produce():
+        nonlocal error
+        try:
+            async for item in items:
+                await queue.put(item)
+        except Exception as e:
+            error = e
+        await queue.put(done)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while (item := await queue.get()) is not done:
+            yield item
+        if error is not None:
+            raise error
+    finally:
+        producer.cancel()
+
+class _ListingBuffer:
+    """Accumulates formatted listing items, or JSON submission records with `as_json`"""
+
+    def __init__(self, formatter, as_json: bool):
+        self.formatter = formatter
+        self.as_json = as_json
+        self.count = 0
+        self._records = []
+        self._buf = io.StringIO()
+
+    def add(self, item) -> None:
+        logger.debug("Processing listing item: %s", item.id)
+        if self.as_json:
+            self._records.append(_submission_record(item))
+        else:
+            if self.count:
+                self._buf.write("\n\n")
+            self._buf.write(self.formatter(item))
+        self.count += 1
+
+    def result(self) -> tuple[str, int]:
+        if self.as_json:
+            return json.dumps(self._records, ensure_ascii=False), self.count
+        return self._buf.getvalue(), self.count
+
+async def _collect_listing(items, formatter=_format_submission, as_json: bool = False) -> tuple[str, int]:
+    """Helper method to format a listing as it arrives.
+
+    `items` is either an async network listing, which is prefetched ahead of
+    formatting, or an in-memory list, which is formatted directly.
+    With `as_json`, the text is a JSON array of submission records instead.
+    Returns the text and the number of items it contains.
+    """
+    listing = _ListingBuffer(formatter, as_json)
+    if hasattr(items, "__aiter__"):
+        async for item in _prefetch(items):
+            listing.add(item)
+    else:
+        for item in items:
+            listing.add(item)
+    return listing.result()
+
+# Maximum number of posts get_post_details_many fetches at the same time
+POST_DETAILS_CONCURRENCY = 8
+
+@mcp.tool()
+async def get_post_details_many(post_ids: list[str], comment_limit: int = 100, comment_sort: str = "best") -> str:
+    """
+    Get post details with full comments for several posts at once.
+
+    Args:
+        post_ids: Reddit post IDs.
+        comment_limit: Number of top-level comments to fetch per post (default: 100).
+        comment_sort: How to sort comments (e.g., "best", "top", "new", "controversial", "old", "qa", "random").
+
+    Returns:
+        Human readable string containing each post's content and comments tree, in the order given.
+    """
+    logger.info("get_post_details_many called with post_ids=%s, comment_limit=%s, comment_sort='%s'", post_ids, comment_limit, comment_sort)
+    semaphore = asyncio.Semaphore(POST_DETAILS_CONCURRENCY)
+
+    async def fetch(post_id: str) -> str:
+        async with semaphore:
+            return await get_post_details(post_id, comment_limit, comment_sort)
+
+    # Fetch each distinct post once, even if it is listed more than once
+    unique_ids = list(dict.fromkeys(post_ids))
+    results = await asyncio.gather(*[fetch(post_id) for post_id in unique_ids], return_exceptions=True)
+    details = {
+        post_id: (
+            _error_response(result, "get_post_details_many for post_id '%s'", post_id)
+            if isinstance(result, BaseException) else result
+        )
+        for post_id, result in zip(unique_ids, results)
+    }
+    logger.info("Retrieved details for %s posts", len(unique_ids))
+    return "\n\n===\n\n".join(details[post_id] for post_id in post_ids)
 
 @mcp.tool()
-async def search_posts(query: str, subreddit: Optional[str] = None, sort: str = "relevance", time_filter: str = "all", limit: int = 25) -> str:
+@_cached_tool(LISTING_CACHE_TTL)
+async def search_posts(query: str, subreddit: Optional[str] = None, sort: str = "relevance", time_filter: str = "all", limit: int = 25, as_json: bool = False) -> str:
     """
     Search Reddit posts.
 
@@ -155,59 +522,32 @@ async def search_posts(query: str, subreddit: Optional[str] = None, sort: str =
         sort: How to sort the results (e.g., "relevance", "hot", "top", "new").
         time_filter: Filter results by time (e.g., "hour", "day", "week", "month", "year", "all").
         limit: Number of posts to fetch (default: 25).
+        as_json: Return the posts as a JSON array instead (default: False).
 
     Returns:
         Human readable string containing a list of post information.
     """
-    logger.info(f"search_posts called with query='{query}', subreddit={subreddit}, sort='{sort}', time_filter='{time_filter}', limit={limit}")
+    logger.info("search_posts called with query='%s', subreddit=%s, sort='%s', time_filter='%s', limit=%s", query, subreddit, sort, time_filter, limit)
     try:
-        posts = []
-        search_params = {
-            'q': query,
-            'sort': sort,
-            't': time_filter,
-            'limit': limit
-        }
-        if subreddit:
-            search_params['subreddit'] = subreddit
-
-        logger.debug(f"Search parameters: {search_params}")
-        logger.debug(f"Starting search with client.p.submission.search()")
-        
-        # Use correct redditwarp API: client.p.submission.search(subreddit, query, **params)
-        sr = search_params.pop('subreddit', '')
-        query = search_params.pop('q')
-        sort = search_params.pop('sort', 'relevance')
-        time_filter = search_params.pop('t', 'all')
-        limit = search_params.pop('limit', 25)
-        
-        async for submission in client.p.submission.search(sr, query, amount=limit, sort=sort, time=time_filter):
-            logger.debug(f"Processing search result: {submission.id} - {submission.title[:50]}")
-            post_info = (
-                f"Title: {submission.title}\n"
-                f"Score: {submission.score}\n"
-                f"Comments: {submission.comment_count}\n"
-                f"Author: {submission.author_display_name or '[deleted]'}\n"
-                f"Type: {_get_post_type(submission)}\n"
-                f"Content: {_get_content(submission)}\n"
-                f"Link: https://reddit.com{submission.permalink}\n"
-                f"---"
-            )
-            posts.append(post_info)
+        logger.debug("Starting search with _client().p.submission.search()")
+        content, count = await _collect_listing(
+            _client().p.submission.search(subreddit or '', query, amount=limit, sort=sort, time=time_filter),
+            as_json=as_json,
+        )
 
-        if not posts:
-            logger.info(f"No posts found for search query: '{query}'")
-            return "No posts found matching your criteria."
+        if not count:
+            logger.info("No posts found for search query: '%s'", query)
+            return "[]" if as_json else "No posts found matching your criteria."
         
-        logger.info(f"Successfully found {len(posts)} posts for search query: '{query}'")
-        return "\n\n".join(posts)
+        logger.info("Successfully found %s posts for search query: '%s'", count, query)
+        return content
 
     except Exception as e:
-        logger.error(f"Error in search_posts for query '{query}': {str(e)}", exc_info=True)
-        return f"An error occurred: {str(e)}"
+        return _error_response(e, "search_posts for query '%s'", query)
 
 @mcp.tool()
-async def search_subreddit(subreddit: str, query: str = "", sort: str = "hot", time_filter: str = "week", limit: int = 25) -> str:
+@_cached_tool(LISTING_CACHE_TTL)
+async def search_subreddit(subreddit: str, query: str = "", sort: str = "hot", time_filter: str = "week", limit: int = 25, as_json: bool = False) -> str:
     """
     Search within specific subreddits or get recent posts.
 
@@ -217,209 +557,152 @@ async def search_subreddit(subreddit: str, query: str = "", sort: str = "hot", t
         sort: How to sort the results (e.g., "hot", "top", "new", "relevance").
         time_filter: Filter results by time (e.g., "hour", "day", "week", "month", "year", "all").
         limit: Number of posts to fetch (default: 25).
+        as_json: Return the posts as a JSON array instead (default: False).
 
     Returns:
         Human readable string containing a list of post information.
     """
-    logger.info(f"search_subreddit called with subreddit='{subreddit}', query='{query}', sort='{sort}', time_filter='{time_filter}', limit={limit}")
+    logger.info("search_subreddit called with subreddit='%s', query='%s', sort='%s', time_filter='%s', limit=%s", subreddit, query, sort, time_filter, limit)
     try:
-        posts = []
-        
         # If query is empty, use pull methods instead of search
         if not query.strip():
-            logger.debug(f"Empty query provided, using pull method for r/{subreddit} with sort='{sort}'")
+            logger.debug("Empty query provided, using pull method for r/%s with sort='%s'", subreddit, sort)
             
-            if sort == "hot":
-                async for submission in client.p.subreddit.pull.hot(subreddit, amount=limit):
-                    logger.debug(f"Processing hot post: {submission.id} - {submission.title[:50]}")
-                    post_info = (
-                        f"Title: {submission.title}\n"
-                        f"Score: {submission.score}\n"
-                        f"Comments: {submission.comment_count}\n"
-                        f"Author: {submission.author_display_name or '[deleted]'}\n"
-                        f"Type: {_get_post_type(submission)}\n"
-                        f"Content: {_get_content(submission)}\n"
-                        f"Link: https://reddit.com{submission.permalink}\n"
-                        f"---"
-                    )
-                    posts.append(post_info)
-            elif sort == "new":
-                async for submission in client.p.subreddit.pull.new(subreddit, amount=limit):
-                    logger.debug(f"Processing new post: {submission.id} - {submission.title[:50]}")
-                    post_info = (
-                        f"Title: {submission.title}\n"
-                        f"Score: {submission.score}\n"
-                        f"Comments: {submission.comment_count}\n"
-                        f"Author: {submission.author_display_name or '[deleted]'}\n"
-                        f"Type: {_get_post_type(submission)}\n"
-                        f"Content: {_get_content(submission)}\n"
-                        f"Link: https://reddit.com{submission.permalink}\n"
-                        f"---"
-                    )
-                    posts.append(post_info)
+            if sort == "new":
+                submissions = _client().p.subreddit.pull.new(subreddit, amount=limit)
             elif sort == "top":
-                async for submission in client.p.subreddit.pull.top(subreddit, amount=limit, time=time_filter):
-                    logger.debug(f"Processing top post: {submission.id} - {submission.title[:50]}")
-                    post_info = (
-                        f"Title: {submission.title}\n"
-                        f"Score: {submission.score}\n"
-                        f"Comments: {submission.comment_count}\n"
-                        f"Author: {submission.author_display_name or '[deleted]'}\n"
-                        f"Type: {_get_post_type(submission)}\n"
-                        f"Content: {_get_content(submission)}\n"
-                        f"Link: https://reddit.com{submission.permalink}\n"
-                        f"---"
-                    )
-                    posts.append(post_info)
+                submissions = _client().p.subreddit.pull.top(subreddit, amount=limit, time=time_filter)
             else:
-                # Default to hot for other sort types when no query
-                logger.debug(f"Unknown sort '{sort}' with empty query, defaulting to hot")
-                async for submission in client.p.subreddit.pull.hot(subreddit, amount=limit):
-                    logger.debug(f"Processing hot post (default): {submission.id} - {submission.title[:50]}")
-                    post_info = (
-                        f"Title: {submission.title}\n"
-                        f"Score: {submission.score}\n"
-                        f"Comments: {submission.comment_count}\n"
-                        f"Author: {submission.author_display_name or '[deleted]'}\n"
-                        f"Type: {_get_post_type(submission)}\n"
-                        f"Content: {_get_content(submission)}\n"
-                        f"Link: https://reddit.com{submission.permalink}\n"
-                        f"---"
-                    )
-                    posts.append(post_info)
-                    
-            if not posts:
-                logger.info(f"No posts found in r/{subreddit}")
-                return f"No posts found in r/{subreddit}."
-            logger.info(f"Successfully found {len(posts)} posts in r/{subreddit} using pull method")
-            return "\n\n".join(posts)
+                if sort != "hot":
+                    # Default to hot for other sort types when no query
+                    logger.debug("Unknown sort '%s' with empty query, defaulting to hot", sort)
+                submissions = _client().p.subreddit.pull.hot(subreddit, amount=limit)
+            content, count = await _collect_listing(submissions, as_json=as_json)
+
+            if not count:
+                logger.info("No posts found in r/%s", subreddit)
+                return "[]" if as_json else f"No posts found in r/{subreddit}."
+            logger.info("Successfully found %s posts in r/%s using pull method", count, subreddit)
+            return content
         
         else:
             # Use search API when query is provided
-            logger.debug(f"Query provided, using search method for r/{subreddit}")
-            async for submission in client.p.submission.search(subreddit, query, amount=limit, sort=sort, time=time_filter):
-                logger.debug(f"Processing subreddit search result: {submission.id} - {submission.title[:50]}")
-                post_info = (
-                    f"Title: {submission.title}\n"
-                    f"Score: {submission.score}\n"
-                    f"Comments: {submission.comment_count}\n"
-                    f"Author: {submission.author_display_name or '[deleted]'}\n"
-                    f"Type: {_get_post_type(submission)}\n"
-                    f"Content: {_get_content(submission)}\n"
-                    f"Link: https://reddit.com{submission.permalink}\n"
-                    f"---"
-                )
-                posts.append(post_info)
-
-            if not posts:
-                logger.info(f"No posts found in r/{subreddit} for query: '{query}'")
-                return f"No posts found in r/{subreddit} matching your criteria."
+            logger.debug("Query provided, using search method for r/%s", subreddit)
+            content, count = await _collect_listing(
+                _client().p.submission.search(subreddit, query, amount=limit, sort=sort, time=time_filter),
+                as_json=as_json,
+            )
+
+            if not count:
+                logger.info("No posts found in r/%s for query: '%s'", subreddit, query)
+                return "[]" if as_json else f"No posts found in r/{subreddit} matching your criteria."
             
-            logger.info(f"Successfully found {len(posts)} posts in r/{subreddit} for query: '{query}'")
-            return "\n\n".join(posts)
+            logger.info("Successfully found %s posts in r/%s for query: '%s'", count, subreddit, query)
+            return content
 
     except Exception as e:
-        logger.error(f"Error in search_subreddit for subreddit '{subreddit}' and query '{query}': {str(e)}", exc_info=True)
-        return f"An error occurred: {str(e)}"
+        return _error_response(e, "search_subreddit for subreddit '%s' and query '%s'", subreddit, query)
 
 @mcp.tool()
-async def fetch_reddit_new_threads(subreddit: str, limit: int = 10) -> str:
+@_cached_tool(LISTING_CACHE_TTL)
+async def fetch_reddit_new_threads(subreddit: str, limit: int = 10, as_json: bool = False) -> str:
     """
     Fetch new/recent threads from a subreddit
     
     Args:
         subreddit: Name of the subreddit
         limit: Number of posts to fetch (default: 10)
+        as_json: Return the posts as a JSON array instead (default: False)
     
     Returns:
         Human readable string containing list of recent post information
     """
-    logger.info(f"fetch_reddit_new_threads called with subreddit='{subreddit}', limit={limit}")
+    logger.info("fetch_reddit_new_threads called with subreddit='%s', limit=%s", subreddit, limit)
     try:
-        posts = []
-        logger.debug(f"Starting to fetch new posts from r/{subreddit}")
-        async for submission in client.p.subreddit.pull.new(subreddit, limit):
-            logger.debug(f"Processing new submission: {submission.id} - {submission.title[:50]}")
-            post_info = (
-                f"Title: {submission.title}\n"
-                f"Score: {submission.score}\n"
-                f"Comments: {submission.comment_count}\n"
-                f"Author: {submission.author_display_name or '[deleted]'}\n"
-                f"Type: {_get_post_type(submission)}\n"
-                f"Content: {_get_content(submission)}\n"
-                f"Link: https://reddit.com{submission.permalink}\n"
-                f"---"
-            )
-            posts.append(post_info)
-
-        logger.info(f"Successfully fetched {len(posts)} new posts from r/{subreddit}")
-        return "\n\n".join(posts)
+        logger.debug("Starting to fetch new posts from r/%s", subreddit)
+        content, count = await _collect_listing(_client().p.subreddit.pull.new(subreddit, limit), as_json=as_json)
+        logger.info("Successfully fetched %s new posts from r/%s", count, subreddit)
+        return content
 
     except Exception as e:
-        logger.error(f"Error in fetch_reddit_new_threads: {str(e)}", exc_info=True)
-        return f"An error occurred: {str(e)}"
+        return _error_response(e, "fetch_reddit_new_threads")
+
+async def _collect_user_posts(username: str, limit: int) -> tuple[str, int]:
+    """Helper method to fetch and format a user's posts"""
+    logger.debug("Fetching posts for user u/%s", username)
+    return await _collect_listing(
+        _client().p.user.pull.submitted(username, amount=limit),
+        _format_user_submission,
+    )
+
+def _format_user_comment(comment) -> str:
+    """Helper method to format a comment for user comment listings"""
+    return _USER_COMMENT_TEMPLATE % (
+        comment.submission.id36,
+        comment.score,
+        comment.body,
+        comment.permalink,
+    )
+
+async def _collect_user_comments(username: str, limit: int) -> tuple[str, int]:
+    """Helper method to fetch and format a user's comments"""
+    logger.debug("Fetching comments for user u/%s", username)
+    return await _collect_listing(
+        _client().p.user.pull.comments(username, amount=limit),
+        _format_user_comment,
+    )
+
+# Collector for each content_type, in the order "both" returns them
+_USER_CONTENT_COLLECTORS = {
+    "posts": _collect_user_posts,
+    "comments": _collect_user_comments,
+}
+
+def _format_user_section(label: str, username: str, text: str, count: int) -> str:
+    """Helper method to format a user's posts or comments under a heading"""
+    if not count:
+        logger.info("No %s found for user u/%s", label, username)
+        return f"No {label} found for user u/{username}."
+    logger.info("Successfully fetched %s %s for user u/%s", count, label, username)
+    return f"{label.capitalize()} by u/{username}:\n\n" + text
 
 @mcp.tool()
+@_cached_tool(LISTING_CACHE_TTL)
 async def get_user_content(username: str, content_type: str = "posts", limit: int = 25) -> str:
     """
     Get user posts/comments.
 
     Args:
         username: The Reddit username.
-        content_type: Type of content to fetch ("posts" or "comments").
-        limit: Number of items to fetch (default: 25).
+        content_type: Type of content to fetch ("posts", "comments", or "both").
+        limit: Number of items of each type to fetch (default: 25).
 
     Returns:
         Human readable string containing a list of user content.
     """
-    logger.info(f"get_user_content called with username='{username}', content_type='{content_type}', limit={limit}")
+    logger.info("get_user_content called with username='%s', content_type='%s', limit=%s", username, content_type, limit)
     try:
-        user_content = []
-        if content_type == "posts":
-            logger.debug(f"Fetching posts for user u/{username}")
-            async for submission in client.p.user.pull.submitted(username, amount=limit):
-                logger.debug(f"Processing user post: {submission.id} - {submission.title[:50]}")
-                post_info = (
-                    f"Title: {submission.title}\n"
-                    f"Score: {submission.score}\n"
-                    f"Comments: {submission.comment_count}\n"
-                    f"Type: {_get_post_type(submission)}\n"
-                    f"Content: {_get_content(submission)}\n"
-                    f"Link: https://reddit.com{submission.permalink}\n"
-                    f"---"
-                )
-                user_content.append(post_info)
-            if not user_content:
-                logger.info(f"No posts found for user u/{username}")
-                return f"No posts found for user u/{username}."
-            logger.info(f"Successfully fetched {len(user_content)} posts for user u/{username}")
-            return f"Posts by u/{username}:\n\n" + "\n\n".join(user_content)
-        elif content_type == "comments":
-            logger.debug(f"Fetching comments for user u/{username}")
-            async for comment in client.p.user.pull.comments(username, amount=limit):
-                logger.debug(f"Processing user comment: {comment.id}")
-                comment_info = (
-                    f"Post ID: {comment.link_id.removeprefix('t3_')}\n"
-                    f"Score: {comment.score}\n"
-                    f"Content: {comment.body}\n"
-                    f"Link: https://reddit.com{comment.permalink}\n"
-                    f"---"
-                )
-                user_content.append(comment_info)
-            if not user_content:
-                logger.info(f"No comments found for user u/{username}")
-                return f"No comments found for user u/{username}."
-            logger.info(f"Successfully fetched {len(user_content)} comments for user u/{username}")
-            return f"Comments by u/{username}:\n\n" + "\n\n".join(user_content)
+        if content_type == "both":
+            labels = tuple(_USER_CONTENT_COLLECTORS)
+        elif content_type in _USER_CONTENT_COLLECTORS:
+            labels = (content_type,)
         else:
-            logger.warning(f"Invalid content_type '{content_type}' provided")
-            return "Invalid content_type. Must be 'posts' or 'comments'."
+            logger.warning("Invalid content_type '%s' provided", content_type)
+            return "Invalid content_type. Must be 'posts', 'comments', or 'both'."
+
+        sections = await asyncio.gather(
+            *[_USER_CONTENT_COLLECTORS[label](username, limit) for label in labels]
+        )
+        return "\n\n".join(
+            _format_user_section(label, username, *section)
+            for label, section in zip(labels, sections)
+        )
 
     except Exception as e:
-        logger.error(f"Error in get_user_content for user '{username}': {str(e)}", exc_info=True)
-        return f"An error occurred: {str(e)}"
+        return _error_response(e, "get_user_content for user '%s'", username)
 
 @mcp.tool()
+@_cached_tool(TRENDING_CACHE_TTL, maxsize=64)
 async def get_trending_subreddits(limit: int = 10) -> str:
     """
     Get trending subreddits.
@@ -430,87 +713,148 @@ async def get_trending_subreddits(limit: int = 10) -> str:
     Returns:
         Human readable string containing a list of trending subreddit names.
     """
-    logger.info(f"get_trending_subreddits called with limit={limit}")
+    logger.info("get_trending_subreddits called with limit=%s", limit)
     try:
         trending_subs = []
-        logger.debug(f"Fetching trending subreddits with limit {limit}")
-        async for subreddit in client.p.subreddit.pulls.popular(amount=limit):
-            logger.debug(f"Found trending subreddit: r/{subreddit.name}")
-            trending_subs.append(subreddit.name)
+        _append = trending_subs.append
+        logger.debug("Fetching trending subreddits with limit %s", limit)
+        async for subreddit in _client().p.subreddit.pulls.popular(amount=limit):
+            logger.debug("Found trending subreddit: r/%s", subreddit.name)
+            _append(subreddit.name)
 
         if not trending_subs:
             logger.info("No trending subreddits found")
             return "No trending subreddits found."
-        logger.info(f"Successfully fetched {len(trending_subs)} trending subreddits")
+        logger.info("Successfully fetched %s trending subreddits", len(trending_subs))
         return "Trending Subreddits:\n" + "\n".join(trending_subs)
 
     except Exception as e:
-        logger.error(f"Error in get_trending_subreddits: {str(e)}", exc_info=True)
-        return f"An error occurred: {str(e)}"
+        return _error_response(e, "get_trending_subreddits")
+
+# Searches are cached per subreddit rather than per merged result, so a
+# subreddit whose search failed is retried on the next call instead of
+# staying missing from a cached partial listing
+_SEARCH_CACHE = _TTLCache(maxsize=256, ttl=LISTING_CACHE_TTL)
+
+async def _search_one(subreddit: str, query: str, sort: str, time_filter: str, limit: int) -> list:
+    """Helper method to drain a single subreddit search into a list, reusing a recent one"""
+    key = (subreddit, query, sort, time_filter, limit)
+    results = _SEARCH_CACHE.get(key)
+    if results is not None:
+        logger.debug("Cache hit for search %s", key)
+        return results
+    results = []
+    _append = results.append
+    async for submission in _client().p.submission.search(subreddit, query, amount=limit, sort=sort, time=time_filter):
+        _append(submission)
+    _SEARCH_CACHE.set(key, results)
+    return results
 
 @mcp.tool()
-async def search_multiple_subreddits(subreddits: list[str], query: str, sort: str = "relevance", time_filter: str = "all", limit: int = 25) -> str:
+async def search_multiple_subreddits(subreddits: list[str], query: str, sort: str = "relevance", time_filter: str = "all", limit: int = 25, combined: bool = False, as_json: bool = False) -> str:
     """
     Multi-reddit search.
 
+    By default each subreddit is searched concurrently and the results are
+    merged, using one API request per subreddit. "new" and "top" results are
+    ordered by date and score; other sorts interleave each subreddit's results
+    rank by rank, taking the subreddits in alphabetical order. Set `combined`
+    to issue a single combined search instead, which is gentler on Reddit's
+    rate limit.
+
     Args:
         subreddits: A list of subreddit names to search within.
         query: The search query string.
         sort: How to sort the results (e.g., "relevance", "hot", "top", "new").
         time_filter: Filter results by time (e.g., "hour", "day", "week", "month", "year", "all").
         limit: Number of posts to fetch (default: 25).
+        combined: Search all subreddits with one combined request (default: False).
+        as_json: Return the posts as a JSON array instead (default: False).
 
     Returns:
         Human readable string containing a list of post information.
     """
-    logger.info(f"search_multiple_subreddits called with subreddits={subreddits}, query='{query}', sort='{sort}', time_filter='{time_filter}', limit={limit}")
+    logger.info("search_multiple_subreddits called with subreddits=%s, query='%s', sort='%s', time_filter='%s', limit=%s, combined=%s", subreddits, query, sort, time_filter, limit, combined)
+    # Subreddit names are case-insensitive; a sorted, deduplicated tuple avoids
+    # searching the same subreddit twice and gives equivalent lists one order
+    subs = tuple(sorted({sr.strip().lower() for sr in subreddits} - {""}))
+    if not subs:
+        # An empty combined name would search all of Reddit instead
+        logger.warning("No subreddit names given to search_multiple_subreddits")
+        return "No subreddits given. Provide at least one subreddit name."
+    return await _search_multiple_subreddits(subs, query, sort, time_filter, limit, combined, as_json)
+
+async def _search_multiple_subreddits(subreddits: tuple[str, ...], query: str, sort: str, time_filter: str, limit: int, combined: bool, as_json: bool) -> str:
+    """Helper method to search and merge results across canonicalized subreddits"""
     try:
-        posts = []
-        subreddit_string = "+".join(subreddits)
-        logger.debug(f"Combined subreddit string: {subreddit_string}")
-        search_params = {
-            'q': query,
-            'sort': sort,
-            't': time_filter,
-            'limit': limit,
-            'subreddit': subreddit_string
-        }
-
-        logger.debug(f"Multi-subreddit search parameters: {search_params}")
-        logger.debug(f"Starting multi-subreddit search with client.p.submission.search()")
-        
-        # Use correct redditwarp API: client.p.submission.search(subreddit, query, **params)
-        sr = search_params.pop('subreddit')
-        query = search_params.pop('q')
-        sort = search_params.pop('sort', 'relevance')
-        time_filter = search_params.pop('t', 'all')
-        limit = search_params.pop('limit', 25)
-        
-        async for submission in client.p.submission.search(sr, query, amount=limit, sort=sort, time=time_filter):
-            logger.debug(f"Processing multi-subreddit search result: {submission.id} - {submission.title[:50]}")
-            post_info = (
-                f"Title: {submission.title}\n"
-                f"Score: {submission.score}\n"
-                f"Comments: {submission.comment_count}\n"
-                f"Author: {submission.author_display_name or '[deleted]'}\n"
-                f"Type: {_get_post_type(submission)}\n"
-                f"Content: {_get_content(submission)}\n"
-                f"Link: https://reddit.com{submission.permalink}\n"
-                f"---"
+        if combined:
+            subreddit_string = "+".join(subreddits)
+            logger.debug("Combined subreddit string: %s", subreddit_string)
+            logger.debug("Starting multi-subreddit search with _client().p.submission.search()")
+            submissions = await _search_one(subreddit_string, query, sort, time_filter, limit)
+        else:
+            logger.debug("Starting concurrent search across %s subreddits", len(subreddits))
+            results = await asyncio.gather(
+                *[_search_one(sr, query, sort, time_filter, limit) for sr in subreddits],
+                return_exceptions=True,
             )
-            posts.append(post_info)
-
-        if not posts:
-            logger.info(f"No posts found in subreddits {', '.join(subreddits)} for query: '{query}'")
-            return f"No posts found in subreddits {', '.join(subreddits)} matching your criteria."
+            ranked = []
+            errors = []
+            for sr, result in zip(subreddits, results):
+                if isinstance(result, BaseException):
+                    logger.warning("Search failed for r/%s: %s", sr, result)
+                    errors.append(result)
+                else:
+                    ranked.append(result)
+            if errors and len(errors) == len(results):
+                raise errors[0]
+
+            if sort in ("new", "top"):
+                # Both orders are comparable across subreddits, so merge on them
+                key = (lambda s: s.created_ut) if sort == "new" else (lambda s: s.score)
+                submissions = [s for result in ranked for s in result]
+                submissions.sort(key=key, reverse=True)
+            else:
+                # Relevance and hot ranks are per-subreddit, so interleave the
+                # results rank by rank instead, in the (alphabetical) order of
+                # the canonicalized subreddit names
+                submissions = [
+                    s for rank in itertools.zip_longest(*ranked) for s in rank if s is not None
+                ]
+            del submissions[limit:]
+
+        content, count = await _collect_listing(submissions, as_json=as_json)
+
+        if not count:
+            logger.info("No posts found in subreddits %s for query: '%s'", ', '.join(subreddits), query)
+            return "[]" if as_json else f"No posts found in subreddits {', '.join(subreddits)} matching your criteria."
         
-        logger.info(f"Successfully found {len(posts)} posts in {len(subreddits)} subreddits for query: '{query}'")
-        return "\n\n".join(posts)
+        logger.info("Successfully found %s posts in %s subreddits for query: '%s'", count, len(subreddits), query)
+        return content
 
     except Exception as e:
-        logger.error(f"Error in search_multiple_subreddits for subreddits {subreddits} and query '{query}': {str(e)}", exc_info=True)
-        return f"An error occurred: {str(e)}"
+        return _error_response(e, "search_multiple_subreddits for subreddits %s and query '%s'", subreddits, query)
+
+def main() -> None:
+    """Run the MCP server on uvloop if available, logging this module's output to stderr"""
+    # stdout carries the stdio transport, so log to stderr only
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    logger.addHandler(handler)
+    if LOG_LEVEL not in logging.getLevelNamesMapping():
+        logger.warning("Unknown MCP_REDDIT_LOG_LEVEL '%s', using INFO", LOG_LEVEL)
+
+    # uvloop is optional; when installed, its event loop cuts per-request overhead
+    try:
+        import uvloop
+    except ImportError:
+        loop_factory = None
+        logger.debug("uvloop not installed, using the default asyncio event loop")
+    else:
+        loop_factory = uvloop.new_event_loop
+        logger.debug("Using uvloop event loop")
+    # Same as mcp.run(), but on the chosen event loop
+    anyio.run(mcp.run_async, backend_options={"loop_factory": loop_factory})
 
 if __name__ == "__main__":
-    import asyncio
-    asyncio.run(mcp.run())
+    main()